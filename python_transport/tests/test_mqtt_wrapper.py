@@ -0,0 +1,43 @@
+import queue
+import pytest
+from select import select
+from wirepas_gateway.protocol.mqtt_wrapper import SelectableQueue
+
+
+def is_readable(q):
+    r, _, _ = select([q], [], [], 0)
+    return q in r
+
+
+def test_selectable_queue_readable_only_with_items():
+    q = SelectableQueue()
+    assert not is_readable(q)
+
+    q.put(1)
+    q.put(2)
+    assert is_readable(q)
+
+    q.get()
+    assert is_readable(q)
+
+    q.get()
+    assert not is_readable(q)
+
+
+def test_selectable_queue_fifo_order():
+    q = SelectableQueue()
+    for i in range(10):
+        q.put(i)
+
+    assert [q.get() for _ in range(10)] == list(range(10))
+
+
+def test_selectable_queue_get_empty():
+    q = SelectableQueue()
+    with pytest.raises(queue.Empty):
+        q.get()
+
+    q.put("item")
+    q.get()
+    with pytest.raises(queue.Empty):
+        q.get()
@@ -0,0 +1,13 @@
+import json
+from wirepas_gateway.utils import serialize
+
+
+def test_serialize_bytes():
+    serialized = serialize({"k": b"\x01\xff"})
+    assert '"01ff"' in serialized
+    assert json.loads(serialized) == {"k": "01ff"}
+
+
+def test_serialize_bytearray():
+    serialized = serialize({"k": bytearray(b"\x01\xff")})
+    assert json.loads(serialized) == {"k": "01ff"}
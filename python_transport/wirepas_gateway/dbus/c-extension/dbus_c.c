@@ -6,6 +6,7 @@
 
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
+#include <string.h>
 #include <systemd/sd-bus.h>
 
 /** \brief  Dbus bus instance*/
@@ -14,6 +15,9 @@ static sd_bus * m_bus = NULL;
 /** \brief  Callback set by Python code to be called on message reception */
 static PyObject * m_message_callback = NULL;
 
+/** \brief  Bitmap of destination endpoints whose packets are dropped in C */
+static uint8_t m_ignored_ep[256 / 8];
+
 /** \brief  Callback called when a packet is received from bus */
 static int on_packet_received(sd_bus_message * m, void * userdata, sd_bus_error * ret_error)
 {
@@ -45,6 +49,12 @@ static int on_packet_received(sd_bus_message * m, void * userdata, sd_bus_error
         return r;
     }
 
+    /* Filter out ignored endpoints without taking the GIL */
+    if (m_ignored_ep[dst_ep / 8] & (1 << (dst_ep % 8)))
+    {
+        return 0;
+    }
+
     r = sd_bus_message_read_array(m, 'y', &bytes_arr, &size);
     if (r < 0)
     {
@@ -178,11 +188,70 @@ static PyObject * setCallback(PyObject * self, PyObject * args)
     return result;
 }
 
+/**
+ * \brief   Function to set from python the destination endpoints to ignore
+ * \note    It must be called before starting the event loop as the
+ *          filter is read without any lock from the event loop thread
+ */
+static PyObject * setIgnoredEndpoints(PyObject * self, PyObject * args)
+{
+    PyObject * ep_list;
+    PyObject * iterator;
+    PyObject * item;
+    uint8_t ignored_ep[sizeof(m_ignored_ep)] = {0};
+    long ep;
+
+    if (!PyArg_ParseTuple(args, "O:set_ignored_endpoints", &ep_list))
+    {
+        return NULL;
+    }
+
+    iterator = PyObject_GetIter(ep_list);
+    if (iterator == NULL)
+    {
+        return NULL;
+    }
+
+    while ((item = PyIter_Next(iterator)) != NULL)
+    {
+        ep = PyLong_AsLong(item);
+        Py_DECREF(item);
+        if (ep == -1 && PyErr_Occurred())
+        {
+            Py_DECREF(iterator);
+            return NULL;
+        }
+
+        if (ep < 0 || ep > 255)
+        {
+            Py_DECREF(iterator);
+            PyErr_SetString(PyExc_ValueError, "endpoint out of range");
+            return NULL;
+        }
+
+        ignored_ep[ep / 8] |= 1 << (ep % 8);
+    }
+    Py_DECREF(iterator);
+
+    if (PyErr_Occurred())
+    {
+        return NULL;
+    }
+
+    memcpy(m_ignored_ep, ignored_ep, sizeof(m_ignored_ep));
+
+    Py_RETURN_NONE;
+}
+
 /**
  * \brief   Interface of our C module
  */
 static PyMethodDef myMethods[] = {
     {"setCallback", setCallback, METH_VARARGS, "Initialize the callback"},
+    {"setIgnoredEndpoints",
+     setIgnoredEndpoints,
+     METH_VARARGS,
+     "Set the destination endpoints to ignore"},
     {"infiniteEventLoop", infiniteEventsLoop, METH_NOARGS, "Infinite Event loop"},
     {NULL, NULL, 0, NULL}};
 
@@ -17,13 +17,17 @@ class DbusEventHandler(Thread):
     delegated to C through a Python C extension
     """
 
-    def __init__(self, cb):
+    def __init__(self, cb, ignored_ep_filter=None):
         """
         Initialize the C module wrapper
         :param cb: Python Callback to call from C on packet reception
+        :param ignored_ep_filter: destination endpoints to drop in C
         """
         Thread.__init__(self)
 
+        # Filter must be set before the loop is started
+        if ignored_ep_filter is not None:
+            dbusCExtension.setIgnoredEndpoints(ignored_ep_filter)
 
         dbusCExtension.setCallback(cb)
         self.daemon = True  # Daemonize thread
@@ -67,7 +71,9 @@ class BusClient:
         # Register for packet on Dbus
         if c_extension:
             logging.info("Starting dbus client with c extension")
-            self.c_extension_thread = DbusEventHandler(self._on_data_received_c)
+            self.c_extension_thread = DbusEventHandler(
+                self._on_data_received_c, self.ignore_ep_filter
+            )
         else:
             logging.info("Starting dbus client without c extension")
             # Subscribe to all massages received from any sink (no need for
@@ -93,11 +99,7 @@ class BusClient:
         hop_count,
         data,
     ):
-
-        # Could be done in C extension if needed by providing list to extension
-        if self.ignore_ep_filter is not None and dst_ep in self.ignore_ep_filter:
-            logging.debug("Message received on ep %s filtered out", dst_ep)
-            return
+        # Ignored endpoints are already filtered out in C extension
 
         # Get sink name from sender unique name
         name = self.sink_manager.get_sink_name(sender)
@@ -11,6 +11,36 @@ from .return_code import ReturnCode
 
 DBUS_SINK_PREFIX = "com.wirepas.sink."
 
+# Config keys that are written through a simple dbus property
+CONFIG_TO_DBUS_PARAM = dict(
+    [
+        ("node_address", "NodeAddress"),
+        ("node_role", "NodeRole"),
+        ("network_address", "NetworkAddress"),
+        ("network_channel", "NetworkChannel"),
+        ("channel_map", "ChannelMap"),
+        ("authentication_key", "AuthenticationKey"),
+        ("cipher_key", "CipherKey"),
+    ]
+)
+
+# Scratchpad status and type conversion from dbus values
+DBUS_TO_GATEWAY_STATUS = dict(
+    [
+        (0, wmm.ScratchpadStatus.SCRATCHPAD_STATUS_SUCCESS),
+        (255, wmm.ScratchpadStatus.SCRATCHPAD_STATUS_NEW)
+        # Anything else is ERROR
+    ]
+)
+
+DBUS_TO_GATEWAY_TYPE = dict(
+    [
+        (0, wmm.ScratchpadType.SCRATCHPAD_TYPE_BLANK),
+        (1, wmm.ScratchpadType.SCRATCHPAD_TYPE_PRESENT),
+        (2, wmm.ScratchpadType.SCRATCHPAD_TYPE_PROCESS),
+    ]
+)
+
 
 class Sink:
     def __init__(self, bus, proxy, sink_id, unique_name, on_stack_started, on_stack_stopped):
@@ -221,21 +251,9 @@ class Sink:
         # so the last error code will be returned
         res = wmm.GatewayResultCode.GW_RES_OK
 
-        config_to_dbus_param = dict(
-            [
-                ("node_address", "NodeAddress"),
-                ("node_role", "NodeRole"),
-                ("network_address", "NetworkAddress"),
-                ("network_channel", "NetworkChannel"),
-                ("channel_map", "ChannelMap"),
-                ("authentication_key", "AuthenticationKey"),
-                ("cipher_key", "CipherKey"),
-            ]
-        )
-
         # Any following call will stop the stack
-        for param in config_to_dbus_param:
-            tmp = self._set_param(config, param, config_to_dbus_param[param])
+        for param in CONFIG_TO_DBUS_PARAM:
+            tmp = self._set_param(config, param, CONFIG_TO_DBUS_PARAM[param])
             if tmp != wmm.GatewayResultCode.GW_RES_OK:
                 # Update result code only if not success to avoid erasing
                 # previous error (only one return code)
@@ -295,7 +313,7 @@ class Sink:
         try:
             cost = self.proxy.SinkCost
         except GLib.Error:
-            logging.error("Cannot get sink cost for sink {}".format(self.sink_id))
+            logging.error("Cannot get sink cost for sink %s", self.sink_id)
             cost = 0
         return cost
 
@@ -312,21 +330,14 @@ class Sink:
                 logging.warning("Node role is not a sink, sink cost cannot be modified")
                 raise ValueError("Wrong role to set cost value {}".format(new_cost))
             else:
-                logging.error("Cannot set sink cost for sink {} ({})".format(self.sink_id, res))
+                logging.error("Cannot set sink cost for sink %s (%s)", self.sink_id, res)
 
     def get_scratchpad_status(self):
         d = {}
 
-        dbus_to_gateway_satus = dict(
-            [
-                (0, wmm.ScratchpadStatus.SCRATCHPAD_STATUS_SUCCESS),
-                (255, wmm.ScratchpadStatus.SCRATCHPAD_STATUS_NEW)
-                # Anything else is ERROR
-            ]
-        )
         try:
             status = self.proxy.StoredStatus
-            d["stored_status"] = dbus_to_gateway_satus[status]
+            d["stored_status"] = DBUS_TO_GATEWAY_STATUS[status]
         except GLib.Error:
             # Exception raised when getting attribute (probably not set)
             logging.error("Cannot get stored status in config")
@@ -335,16 +346,9 @@ class Sink:
             logging.error("Scratchpad stored status has error: %s", status)
             d["stored_status"] = wmm.ScratchpadStatus.SCRATCHPAD_STATUS_ERROR
 
-        dbus_to_gateway_type = dict(
-            [
-                (0, wmm.ScratchpadType.SCRATCHPAD_TYPE_BLANK),
-                (1, wmm.ScratchpadType.SCRATCHPAD_TYPE_PRESENT),
-                (2, wmm.ScratchpadType.SCRATCHPAD_TYPE_PROCESS),
-            ]
-        )
         try:
             stored_type = self.proxy.StoredType
-            d["stored_type"] = dbus_to_gateway_type[stored_type]
+            d["stored_type"] = DBUS_TO_GATEWAY_TYPE[stored_type]
         except GLib.Error:
             # Exception raised when getting attribute (probably not set)
             logging.error("Cannot get stored type in config\n")
@@ -570,11 +574,10 @@ class SinkManager:
             sink.unregister_from_stack_started()
 
             # Remove Sink to association list
-            for k, v in self.sender_to_name.items():
-                if v == short_name:
-                    self.sender_to_name.pop(k)
-                    logging.warning("Association removed from %s => %s", k, v)
-                    break
+            if self.sender_to_name.pop(sink.unique_name, None) is not None:
+                logging.warning(
+                    "Association removed from %s => %s", sink.unique_name, short_name
+                )
 
             # call client cb
             if self.rm_cb is not None:
@@ -608,20 +611,20 @@ class SinkManager:
                 )
 
     def get_sinks(self):
-        # Return a list that is a copy to avoid modification
+        # Return an immutable copy to avoid modification
         # of list while iterating on it (if new sink is connected)
-        return list(self.sinks.values())
+        return tuple(self.sinks.values())
 
     def get_sink_name(self, bus_name):
-        try:
-            return self.sender_to_name[bus_name]
-        except KeyError:
+        # Called for each received packet, avoid raising on unknown sink
+        name = self.sender_to_name.get(bus_name)
+        if name is None:
             logging.error("Unknown sink %s from sink list", bus_name)
-            return None
+        return name
 
     def get_sink(self, short_name):
-        try:
-            return self.sinks[short_name]
-        except KeyError:
+        # Called for each received packet, avoid raising on unknown sink
+        sink = self.sinks.get(short_name)
+        if sink is None:
             logging.error("Unknown sink %s from sink list", short_name)
-            return None
+        return sink
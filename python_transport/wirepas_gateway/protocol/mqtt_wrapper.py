@@ -3,13 +3,14 @@
 # See file LICENSE for full license details.
 
 import logging
+import os
 import queue
 import socket
 import ssl
+from collections import deque
 from select import select
 from threading import Thread, Lock
-from time import sleep
-from datetime import datetime
+from time import sleep, monotonic
 
 from paho.mqtt import client as mqtt
 from paho.mqtt.client import connack_string
@@ -91,8 +92,10 @@ class MQTTWrapper(Thread):
             )
         except (socket.gaierror, ValueError) as e:
             logging.error(
-                "Error on MQTT address %s:%d => %s"
-                % (settings.mqtt_hostname, settings.mqtt_port, str(e))
+                "Error on MQTT address %s:%d => %s",
+                settings.mqtt_hostname,
+                settings.mqtt_port,
+                e,
             )
             exit(-1)
         except ConnectionRefusedError:
@@ -168,22 +171,29 @@ class MQTTWrapper(Thread):
                         topic, payload, qos=qos, retain=retain
                     )
 
-                    # FIX: read internal sockpairR as it is written but
-                    # never read as we don't use the internal paho loop
-                    # but we have spurious timeout / broken pipe from
-                    # this socket pair
-                    # pylint: disable=protected-access
-                    try:
-                        self._client._sockpairR.recv(1)
-                    except Exception:
-                        # This socket is not used at all, so if something is wrong,
-                        # not a big issue. Just keep going
-                        pass
-
             except queue.Empty:
                 # No more packet to publish
                 pass
 
+            self._drain_paho_sockpair()
+
+    def _drain_paho_sockpair(self):
+        # FIX: read internal sockpairR as it is written but
+        # never read as we don't use the internal paho loop
+        # but we have spurious timeout / broken pipe from
+        # this socket pair.
+        # Paho writes one byte per publish, so consume all of them
+        # at once instead of one recv per published packet
+        # pylint: disable=protected-access
+        try:
+            while self._client._sockpairR.recv(4096):
+                pass
+        except Exception:
+            # Nothing left to read on this non blocking socket. Or this
+            # socket is not used at all, so if something is wrong,
+            # not a big issue. Just keep going
+            pass
+
     def _get_socket(self):
         sock = self._client.socket()
         if sock is not None:
@@ -199,11 +209,11 @@ class MQTTWrapper(Thread):
         # Socket is not opened anymore, try to reconnect for timeout if set
         loop_forever = self.timeout == 0
         delay = 0
-        logging.info("Starting reconnect loop with timeout %d" % self.timeout)
+        logging.info("Starting reconnect loop with timeout %d", self.timeout)
         # Loop forever or until timeout is over
         while loop_forever or (delay <= self.timeout):
             try:
-                logging.debug("MQTT reconnect attempt delay=%d" % delay)
+                logging.debug("MQTT reconnect attempt delay=%d", delay)
                 ret = self._client.reconnect()
                 if ret == mqtt.MQTT_ERR_SUCCESS:
                     break
@@ -296,7 +306,7 @@ class MQTTWrapper(Thread):
         self._publish_monitor.on_publish_request()
 
     def subscribe(self, topic, cb, qos=2) -> None:
-        logging.debug("Subscribing to: {}".format(topic))
+        logging.debug("Subscribing to: %s", topic)
         self._client.subscribe(topic, qos)
         self._client.message_callback_add(topic, cb)
 
@@ -309,45 +319,46 @@ class MQTTWrapper(Thread):
         return self._publish_monitor.get_publish_waiting_time_s()
 
 
-class SelectableQueue(queue.Queue):
+class SelectableQueue:
     """
-    Wrapper arround a Queue to make it selectable with an associated
-    socket
+    Simple queue made selectable with an associated pipe.
+    Items are only accessed under its own lock, so there is no need
+    to pay for the extra internal locking of a queue.Queue
     """
 
     def __init__(self):
-        super().__init__()
-        self._putsocket, self._getsocket = socket.socketpair()
+        # A pipe is enough to signal select, no need for a full socket pair
+        self._read_fd, self._write_fd = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
         self._lock = Lock()
-        self._size = 0
+        self._items = deque()
 
     def fileno(self):
         """
         Implement fileno to be selectable
-        :return: the reception socket fileno
+        :return: the reading end of the pipe
         """
-        return self._getsocket.fileno()
+        return self._read_fd
 
-    def put(self, item, block=True, timeout=None):
+    def put(self, item):
         with self._lock:
-            if self._size == 0:
-                # Send 1 byte on socket to signal select
-                self._putsocket.send(b"x")
-            self._size = self._size + 1
+            if not self._items:
+                # Write 1 byte on pipe to signal select
+                os.write(self._write_fd, b"x")
 
             # Insert item in queue
-            super().put(item, block, timeout)
+            self._items.append(item)
 
-    def get(self, block=False, timeout=None):
+    def get(self):
         with self._lock:
-            # Get item first so get can be called and
-            # raise empty exception
-            item = super().get(block, timeout)
-
-            self._size = self._size - 1
-            if self._size == 0:
-                # Consume 1 byte from socket
-                self._getsocket.recv(1)
+            try:
+                item = self._items.popleft()
+            except IndexError:
+                # Same exception as a queue.Queue for callers
+                raise queue.Empty from None
+
+            if not self._items:
+                # Consume 1 byte from pipe
+                os.read(self._read_fd, 1)
             return item
 
 
@@ -371,16 +382,15 @@ class PublishMonitor:
             if self._size == 0:
                 return 0
             else:
-                delta = datetime.now() - self._last_publish_event_timestamp
-                return delta.total_seconds()
+                return monotonic() - self._last_publish_event_timestamp
 
     def on_publish_request(self):
         with self._lock:
             if self._size == 0:
-                self._last_publish_event_timestamp = datetime.now()
+                self._last_publish_event_timestamp = monotonic()
             self._size = self._size + 1
 
     def on_publish_done(self):
         with self._lock:
             self._size = self._size - 1
-            self._last_publish_event_timestamp = datetime.now()
+            self._last_publish_event_timestamp = monotonic()
@@ -16,12 +16,7 @@ class TopicGenerator:
 
     @staticmethod
     def _make_topic(base, cmd, params):
-        req = base + "/" + cmd
-
-        for param in params:
-            req += "/" + param
-
-        return req
+        return "/".join([base, cmd, *params])
 
     ##################
     # Requests Part
@@ -6,9 +6,13 @@ import logging
 import os
 import sys
 import wirepas_mesh_messaging as wmm
-from time import time, sleep
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import count
+from time import time, monotonic
 from uuid import getnode
-from threading import Thread
+from threading import Thread, Event
+from gi.repository import GLib
 
 from wirepas_gateway.dbus.dbus_client import BusClient
 from wirepas_gateway.protocol.topic_helper import TopicGenerator, TopicParser
@@ -21,6 +25,14 @@ from wirepas_gateway import __pkg_name__
 # This constant is the actual API level implemented by this transport module (cf WP-RM-128)
 IMPLEMENTED_API_VERSION = 2
 
+# Maximum number of requests from backend handled in parallel
+MAX_REQUEST_HANDLING_THREADS = 8
+
+# Pool of threads to handle requests received from backend
+_request_executor = ThreadPoolExecutor(
+    max_workers=MAX_REQUEST_HANDLING_THREADS, thread_name_prefix="request"
+)
+
 
 class ConnectionToBackendMonitorThread(Thread):
 
@@ -66,6 +78,8 @@ class ConnectionToBackendMonitorThread(Thread):
 
         self.running = False
         self.disconnected = False
+        # Event to interrupt the wait between two checks
+        self._stop_event = Event()
 
         # Get parameters for black hole algorithm detection
         self.minimum_sink_cost = minimum_sink_cost
@@ -108,6 +122,7 @@ class ConnectionToBackendMonitorThread(Thread):
         self._set_sinks_cost_low()
 
         self.running = True
+        next_check = monotonic()
 
         while self.running:
             if not self.disconnected:
@@ -131,14 +146,23 @@ class ConnectionToBackendMonitorThread(Thread):
                     self._set_sinks_cost_low()
                     self.disconnected = False
 
-            # Wait for period
-            sleep(self.period)
+            # Wait for period. Next check is scheduled from the previous
+            # one so the time spent checking does not make the period drift
+            next_check += self.period
+            delay = next_check - monotonic()
+            if delay < 0:
+                # Checks took longer than the period, restart from now
+                next_check -= delay
+                delay = 0
+
+            self._stop_event.wait(delay)
 
     def stop(self):
         """
         Stop the black hole monitoring thread
         """
         self.running = False
+        self._stop_event.set()
 
     def initialize_sink(self, name):
         """
@@ -170,6 +194,13 @@ class TransportService(BusClient):
     # Period in s to check for black hole issue
     MONITORING_BUFFERING_PERIOD_S = 1
 
+    # Number of received data topics kept in cache
+    RECEIVED_DATA_TOPICS_CACHE_SIZE = 1024
+
+    # Delay in ms to group sink connections/disconnections in a single
+    # get configs response
+    GET_CONFIGS_RESPONSE_DELAY_MS = 100
+
     def __init__(self, settings, **kwargs):
         logging.info("Version is: %s", transport_version)
 
@@ -180,12 +211,31 @@ class TransportService(BusClient):
         )
 
         self.gw_id = settings.gateway_id
+
+        # Log level is set once at startup, so there is no need to check it
+        # again for each received packet
+        self._debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
         self.gw_model = settings.gateway_model
         self.gw_version = settings.gateway_version
 
         self.whitened_ep_filter = settings.whitened_endpoints_filter
 
-        last_will_topic = TopicGenerator.make_status_topic(self.gw_id)
+        # Topics only depending on the gateway id are generated once
+        self.status_topic = TopicGenerator.make_status_topic(self.gw_id)
+        self.get_configs_response_topic = (
+            TopicGenerator.make_get_configs_response_topic(self.gw_id)
+        )
+        self.get_gateway_info_response_topic = (
+            TopicGenerator.make_get_gateway_info_response_topic(self.gw_id)
+        )
+
+        # Received data topic only depends on few values that rarely change
+        # between packets, so cache it instead of generating it each time
+        self._get_received_data_topic = lru_cache(
+            maxsize=self.RECEIVED_DATA_TOPICS_CACHE_SIZE
+        )(TopicGenerator.make_received_data_topic)
+
+        last_will_topic = self.status_topic
         last_will_message = wmm.StatusEvent(
             self.gw_id, wmm.GatewayState.OFFLINE
         ).payload
@@ -222,10 +272,13 @@ class TransportService(BusClient):
             )
             self.monitoring_thread.start()
 
+        # Set when a get configs response is already scheduled
+        self._get_configs_response_pending = False
+
         if settings.debug_incr_data_event_id:
-            self.data_event_id = 0
+            self.data_event_ids = count()
         else:
-            self.data_event_id = None
+            self.data_event_ids = None
 
     def _on_mqtt_wrapper_termination_cb(self):
         """
@@ -239,9 +292,9 @@ class TransportService(BusClient):
     def _set_status(self):
         event_online = wmm.StatusEvent(self.gw_id, wmm.GatewayState.ONLINE)
 
-        topic = TopicGenerator.make_status_topic(self.gw_id)
-
-        self.mqtt_wrapper.publish(topic, event_online.payload, qos=1, retain=True)
+        self.mqtt_wrapper.publish(
+            self.status_topic, event_online.payload, qos=1, retain=True
+        )
 
     def _on_connect(self):
         # Register for get gateway info
@@ -287,9 +340,8 @@ class TransportService(BusClient):
         # update our status.
         # It will work only if we are allowed to register for event topic
         # at broker level
-        topic = TopicGenerator.make_status_topic(self.gw_id)
         self.mqtt_wrapper.subscribe(
-            topic, self._on_own_status_received
+            self.status_topic, self._on_own_status_received
         )
 
         self._set_status()
@@ -312,7 +364,8 @@ class TransportService(BusClient):
 
         if self.whitened_ep_filter is not None and dst_ep in self.whitened_ep_filter:
             # Only publish payload size but not the payload
-            logging.debug("Filtering payload data")
+            if self._debug_enabled:
+                logging.debug("Filtering payload data")
             data_size = data.__len__()
             data = None
         else:
@@ -329,8 +382,13 @@ class TransportService(BusClient):
 
         network_address = sink.get_network_address()
 
+        if self.data_event_ids is not None:
+            data_event_id = next(self.data_event_ids)
+        else:
+            data_event_id = None
+
         event = wmm.ReceivedDataEvent(
-            event_id=self.data_event_id,
+            event_id=data_event_id,
             gw_id=self.gw_id,
             sink_id=sink_id,
             rx_time_ms_epoch=timestamp,
@@ -346,15 +404,11 @@ class TransportService(BusClient):
             network_address=network_address,
         )
 
-        topic = TopicGenerator.make_received_data_topic(
+        topic = self._get_received_data_topic(
             self.gw_id, sink_id, network_address, src_ep, dst_ep
         )
-        logging.debug("Uplink traffic: %s | %s", topic, event.event_id)
-
-        # No need to protect data_event_id as on_data_received is always
-        # called from same thread
-        if self.data_event_id is not None:
-            self.data_event_id += 1
+        if self._debug_enabled:
+            logging.debug("Uplink traffic: %s | %s", topic, event.event_id)
 
         # Set qos to 1 to avoid loading too much the broker
         # unique id in event header can be used for duplicate filtering in
@@ -386,7 +440,7 @@ class TransportService(BusClient):
         topic = TopicGenerator.make_set_config_response_topic(self.gw_id, sink.sink_id)
         self.mqtt_wrapper.publish(topic, response.payload, qos=2)
 
-    def _send_asynchronous_get_configs_response(self):
+    def _get_sink_configs(self):
         # Create a list of different sink configs
         configs = []
         for sink in self.sink_manager.get_sinks():
@@ -394,27 +448,57 @@ class TransportService(BusClient):
             if config is not None:
                 configs.append(config)
 
+        return configs
+
+    def _schedule_asynchronous_get_configs_response(self):
+        # Sinks are often connected or disconnected in bursts (sink service
+        # restart for example), so send a single response for a burst.
+        # A timeout at default priority is used instead of an idle callback
+        # to bound the delay even if received packets are queued on the loop.
+        # Sink events and timeout are both handled from GLib main loop
+        if self._get_configs_response_pending:
+            return
+
+        self._get_configs_response_pending = True
+        GLib.timeout_add(
+            self.GET_CONFIGS_RESPONSE_DELAY_MS, self._on_get_configs_response_timeout
+        )
+
+    def _on_get_configs_response_timeout(self):
+        self._get_configs_response_pending = False
+        self._send_asynchronous_get_configs_response()
+        # Remove the timeout source
+        return False
+
+    def _send_asynchronous_get_configs_response(self):
+        configs = self._get_sink_configs()
+
         # Generate a setconfig answer with req_id of 0 as not from
         # a real request
         response = wmm.GetConfigsResponse(
             0, self.gw_id, wmm.GatewayResultCode.GW_RES_OK, configs
         )
-        topic = TopicGenerator.make_get_configs_response_topic(self.gw_id)
-
-        self.mqtt_wrapper.publish(topic, response.payload, qos=2)
+        self.mqtt_wrapper.publish(
+            self.get_configs_response_topic, response.payload, qos=2
+        )
 
     def deferred_thread(fn):
         """
-        Decorator to handle a request on its own Thread
+        Decorator to handle a request on a Thread from a pool
         to avoid blocking the calling Thread on I/O.
-        It creates a new Thread but it shouldn't impact the performances
-        as requests are not supposed to be really frequent (few per seconds)
+        Pool is bounded so a burst of requests is queued instead of
+        creating a new Thread for each of them
         """
 
+        def handle(*args, **kwargs):
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                # Exception would be silently kept in the future otherwise
+                logging.exception("Unexpected exception when handling request")
+
         def wrapper(*args, **kwargs):
-            thread = Thread(target=fn, args=args, kwargs=kwargs)
-            thread.start()
-            return thread
+            return _request_executor.submit(handle, *args, **kwargs)
 
         return wrapper
 
@@ -427,20 +511,20 @@ class TransportService(BusClient):
             sink = self.sink_manager.get_sink(name)
             if sink is not None:
                 logging.info(
-                    "Initialize sinkCost of sink {} to minimum {}".format(
-                        name, self.minimum_sink_cost
-                    )
+                    "Initialize sinkCost of sink %s to minimum %s",
+                    name,
+                    self.minimum_sink_cost,
                 )
                 try:
                     sink.cost = self.minimum_sink_cost
                 except ValueError:
                     logging.debug("Cannot set cost, probably not a sink")
 
-        self._send_asynchronous_get_configs_response()
+        self._schedule_asynchronous_get_configs_response()
 
     def on_sink_disconnected(self, name):
         logging.info("Sink disconnected, sending new configs")
-        self._send_asynchronous_get_configs_response()
+        self._schedule_asynchronous_get_configs_response()
 
     @deferred_thread
     def _on_send_data_cmd_received(self, client, userdata, message):
@@ -492,19 +576,14 @@ class TransportService(BusClient):
             logging.error(str(e))
             return
 
-        # Create a list of different sink configs
-        configs = []
-        for sink in self.sink_manager.get_sinks():
-            config = sink.read_config()
-            if config is not None:
-                configs.append(config)
+        configs = self._get_sink_configs()
 
         response = wmm.GetConfigsResponse(
             request.req_id, self.gw_id, wmm.GatewayResultCode.GW_RES_OK, configs
         )
-        topic = TopicGenerator.make_get_configs_response_topic(self.gw_id)
-
-        self.mqtt_wrapper.publish(topic, response.payload, qos=2)
+        self.mqtt_wrapper.publish(
+            self.get_configs_response_topic, response.payload, qos=2
+        )
 
     @deferred_thread
     def _on_own_status_received(self, client, userdata, message):
@@ -546,8 +625,9 @@ class TransportService(BusClient):
             implemented_api_version=IMPLEMENTED_API_VERSION,
         )
 
-        topic = TopicGenerator.make_get_gateway_info_response_topic(self.gw_id)
-        self.mqtt_wrapper.publish(topic, response.payload, qos=2)
+        self.mqtt_wrapper.publish(
+            self.get_gateway_info_response_topic, response.payload, qos=2
+        )
 
     @deferred_thread
     def _on_set_config_cmd_received(self, client, userdata, message):
@@ -751,12 +831,13 @@ def parse_setting_list(list_setting):
     """ This function parse ep list specified from setting file or cmd line
 
     Input list has following format [1, 5, 10-15] as a string or list of string
-    and is expended as a single list [1, 5, 10, 11, 12, 13, 14, 15]
+    and is expended as a single set {1, 5, 10, 11, 12, 13, 14, 15}.
+    A set is returned as filters are checked for every received packet
 
     Args:
         list_setting(str or list): the list from setting file or cmd line.
 
-    Returns: A single list of ep
+    Returns: A frozenset of ep
     """
     if isinstance(list_setting, str):
         # List is a string from cmd line
@@ -797,7 +878,7 @@ def parse_setting_list(list_setting):
         except (AttributeError, ValueError):
             raise SyntaxError("Wrong EP range format")
 
-    return single_list
+    return frozenset(single_list)
 
 
 def _check_duplicate(args, old_param, new_param, default):
@@ -853,6 +934,9 @@ def _update_parameters(settings):
         except SyntaxError as e:
             logging.error("Wrong format for ignored_endpoints_filter EP list (%s)", e)
             exit()
+    else:
+        # No filter set (or empty one), so no check is needed
+        settings.ignored_endpoints_filter = None
 
     if settings.whitened_endpoints_filter:
         try:
@@ -860,11 +944,13 @@ def _update_parameters(settings):
                 settings.whitened_endpoints_filter
             )
             logging.debug(
-                "Whitened endpoints are: {}".format(settings.whitened_endpoints_filter)
+                "Whitened endpoints are: %s", settings.whitened_endpoints_filter
             )
         except SyntaxError as e:
             logging.error("Wrong format for whitened_endpoints_filter EP list (%s)", e)
             exit()
+    else:
+        settings.whitened_endpoints_filter = None
 
 
 def _check_parameters(settings):
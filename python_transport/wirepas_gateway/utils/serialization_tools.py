@@ -26,7 +26,8 @@ def json_serial(obj) -> str:
         return obj.isoformat()
 
     if isinstance(obj, (bytearray, bytes)):
-        return binascii.hexlify(obj)
+        # Must return a str, json would call this serializer again on bytes
+        return binascii.b2a_hex(obj).decode("ascii")
     if isinstance(obj, set):
         return str(obj)
 